@@ -0,0 +1,76 @@
+"""
+Startup benchmark for the log analyzer CLI
+
+Times `import user_pattern` and `user_pattern.py --help` in fresh interpreters
+and checks that pandas, NumPy and matplotlib are not loaded by either.
+
+Usage: python benchmarks/bench_startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'numpy', 'matplotlib')
+
+IMPORT_CHECK = (
+    "import sys, user_pattern; "
+    f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]; "
+    "print(','.join(loaded))"
+)
+# Run the CLI as __main__ and report which heavy modules it pulled in
+HELP_CHECK = (
+    "import runpy, sys; sys.argv = ['user_pattern.py', '--help']\n"
+    "try:\n"
+    "    runpy.run_path('user_pattern.py', run_name='__main__')\n"
+    "except SystemExit:\n"
+    "    pass\n"
+    f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print(','.join(loaded), file=sys.stderr)\n"
+)
+
+
+def _time_command(args, runs):
+    """Return (timings in seconds, stdout, stderr of the last run)"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run(args, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        timings.append(time.perf_counter() - started)
+    return timings, result.stdout, result.stderr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help="Subprocess runs per case (default: 5)")
+    args = parser.parse_args(argv)
+
+    baseline, _, _ = _time_command([sys.executable, '-c', 'pass'], args.runs)
+    cases = {
+        'import user_pattern': ([sys.executable, '-c', IMPORT_CHECK], lambda out, err: out),
+        'user_pattern.py --help': ([sys.executable, '-c', HELP_CHECK], lambda out, err: err),
+    }
+
+    failed = False
+    print(f"{'case':<24} {'median ms':>10} {'min ms':>8} {'over python':>12}  heavy modules")
+    print(f"{'python -c pass':<24} {statistics.median(baseline) * 1000:>10.1f} {min(baseline) * 1000:>8.1f}")
+    for name, (command, loaded_from) in cases.items():
+        timings, out, err = _time_command(command, args.runs)
+        loaded = loaded_from(out, err).strip()
+        overhead = (statistics.median(timings) - statistics.median(baseline)) * 1000
+        print(f"{name:<24} {statistics.median(timings) * 1000:>10.1f} {min(timings) * 1000:>8.1f} "
+              f"{overhead:>12.1f}  {loaded or '-'}")
+        if loaded:
+            failed = True
+
+    if failed:
+        print("FAIL: heavy modules were imported at startup", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+import logging
+import threading
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Header segment: [version]. Each published version lives in its own data
+# segment named "<name>_v<version>", so a reader never sees a half-written
+# model; it simply attaches to the newer segment between ticks.
+_HEADER = np.dtype(np.int64)
+_META_FIELDS = 5  # n_states, n_steps, n_unique_steps, n_hours, n_state_slots
+
+
+def _layout(n_states, n_steps, n_unique_steps, n_hours, n_state_slots):
+    """Return [(field, dtype, shape, offset)] and the total size in bytes"""
+    fields = [
+        ('meta', np.int64, (_META_FIELDS,)),
+        ('transition_matrix', np.float64, (n_states, n_states)),
+        ('transition_cdf', np.float64, (n_states, n_states)),
+        ('hours', np.int64, (n_hours,)),
+        ('hour_weights', np.float64, (n_hours,)),
+        ('hour_cdf', np.float64, (n_hours,)),
+        ('step_ids', np.int64, (n_unique_steps,)),   # sorted, for step -> state lookups
+        ('step_states', np.int64, (n_unique_steps,)),
+        ('state_offsets', np.int64, (n_state_slots + 1,)),
+        ('state_steps', np.int64, (n_steps,)),       # step ids grouped by state, mapping order kept
+    ]
+    layout = []
+    offset = 0
+    for field, dtype, shape in fields:
+        layout.append((field, dtype, shape, offset))
+        offset += int(np.prod(shape)) * np.dtype(dtype).itemsize
+    return layout, max(offset, 1)
+
+
+# Serializes segment creation and attachment within this process; see _attach()
+_segment_lock = threading.Lock()
+
+
+def _create(name, size):
+    """Create a segment registered with the resource tracker as usual"""
+    with _segment_lock:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def _attach(name):
+    """
+    Attach to an existing segment without handing it to this process's resource tracker
+
+    Python < 3.13 always registers the segment, and the tracker of a worker that
+    is not a child of the publisher would unlink the live model when it exits.
+    Unregistering afterwards is not an option either: children share the
+    publisher's tracker, so that would drop the publisher's own registration.
+    Registration is therefore switched off while attaching. Segments created
+    through _create() wait for this, but other code in the same process must
+    not create SharedMemory segments from another thread while a model is being
+    attached, or those segments go unregistered.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    with _segment_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _segment_name(name, version):
+    return f"{name}_v{version}"
+
+
+class SharedModelPublisher:
+    """Publish a compiled UserAgent model into shared memory for worker processes"""
+
+    def __init__(self, name=None):
+        """
+        Initialize the publisher
+
+        Args:
+            name (str): Base name of the shared segments (default: random)
+        """
+        self.name = name or f"mal_user_model_{uuid.uuid4().hex[:8]}"
+        self.version = 0
+        self._header = _create(self.name, _HEADER.itemsize)
+        self._version_view = np.ndarray((1,), dtype=_HEADER, buffer=self._header.buf)
+        self._version_view[0] = 0
+        self._segment = None
+
+    def publish(self, transition_matrix, mapping, hour_distribution):
+        """
+        Compile and publish a new model version
+
+        Args:
+            transition_matrix (array): Square state transition matrix
+            mapping (dict): State index -> list of step IDs (as UserAgent.mapping)
+            hour_distribution (dict): Hour -> weight (as TimestampGenerator.hour_distribution)
+
+        Returns:
+            int: The published version
+        """
+        matrix = np.asarray(transition_matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Transition matrix must be square, got shape {matrix.shape}")
+        n_states = matrix.shape[0]
+
+        # Row CDFs; empty rows fall back to uniform like UserAgent does
+        row_sums = matrix.sum(axis=1, keepdims=True)
+        probs = np.divide(matrix, row_sums, out=np.full_like(matrix, 1.0 / n_states), where=row_sums != 0)
+        cdf = np.cumsum(probs, axis=1)
+        cdf[:, -1] = 1.0
+
+        hours = np.array(sorted(hour_distribution), dtype=np.int64)
+        weights = np.array([hour_distribution[h] for h in hours], dtype=np.float64)
+        hour_cdf = np.cumsum(weights) / weights.sum() if len(weights) else weights
+
+        n_state_slots = max([n_states] + [int(s) + 1 for s in mapping])
+        state_steps = []
+        state_offsets = [0]
+        step_to_state = {}
+        for state in range(n_state_slots):
+            for step in mapping.get(state, []):
+                state_steps.append(step)
+                step_to_state.setdefault(step, state)
+            state_offsets.append(len(state_steps))
+        step_ids = sorted(step_to_state)
+
+        arrays = {
+            'meta': [n_states, len(state_steps), len(step_ids), len(hours), n_state_slots],
+            'transition_matrix': matrix,
+            'transition_cdf': cdf,
+            'hours': hours,
+            'hour_weights': weights,
+            'hour_cdf': hour_cdf,
+            'step_ids': step_ids,
+            'step_states': [step_to_state[s] for s in step_ids],
+            'state_offsets': state_offsets,
+            'state_steps': state_steps,
+        }
+        layout, size = _layout(*arrays['meta'])
+        version = self.version + 1
+        segment = _create(_segment_name(self.name, version), size)
+        for field, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset)
+            view[...] = np.asarray(arrays[field], dtype=dtype).reshape(shape)
+            del view
+
+        # Switch readers over, then drop the previous segment; attached readers keep their mapping
+        self._version_view[0] = version
+        self.version = version
+        previous, self._segment = self._segment, segment
+        if previous is not None:
+            previous.close()
+            previous.unlink()
+        logger.debug("Published shared model %s version %d", self.name, version)
+        return version
+
+    def publish_agent(self, agent):
+        """Publish the model held by a UserAgent that is not itself attached to a shared model"""
+        return self.publish(agent.transition_matrix, agent.mapping,
+                            agent.timestamp_generator.hour_distribution)
+
+    def close(self):
+        """Unlink all segments; attached readers keep working until they close"""
+        del self._version_view
+        for segment in (self._segment, self._header):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._segment = self._header = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedModel:
+    """Read-only, zero-copy view of a model published by SharedModelPublisher"""
+
+    def __init__(self, name):
+        """
+        Attach to a published model
+
+        Args:
+            name (str): Base name given to the publisher
+        """
+        self.name = name
+        self._header = _attach(name)
+        self._version_view = np.ndarray((1,), dtype=_HEADER, buffer=self._header.buf)
+        self._segment = None
+        # Superseded segments whose arrays are still referenced by callers
+        self._retired = []
+        self.version = 0
+        if not self.refresh():
+            raise ValueError(f"No model has been published under '{name}'")
+
+    def refresh(self):
+        """Attach to the newest published version; return True if it changed"""
+        for _ in range(10):
+            version = int(self._version_view[0])
+            if version == 0 or version == self.version:
+                return False
+            try:
+                segment = _attach(_segment_name(self.name, version))
+            except FileNotFoundError:
+                # Superseded between reading the header and attaching; try again
+                continue
+            self._release_views()
+            if self._segment is not None:
+                self._retired.append(self._segment)
+            self._close_retired()
+            self._segment = segment
+            self.version = version
+            self._map_views()
+            return True
+        return False
+
+    def _map_views(self):
+        meta = np.ndarray((_META_FIELDS,), dtype=np.int64, buffer=self._segment.buf)
+        layout, _ = _layout(*(int(v) for v in meta))
+        for field, dtype, shape, offset in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=self._segment.buf, offset=offset)
+            view.flags.writeable = False
+            setattr(self, field, view)
+
+    def _close_retired(self):
+        still_referenced = []
+        for segment in self._retired:
+            try:
+                segment.close()
+            except BufferError:
+                still_referenced.append(segment)
+        self._retired = still_referenced
+
+    def _release_views(self):
+        # Views must be dropped before the underlying buffer can be closed
+        for field, _, _, _ in _layout(0, 0, 0, 0, 0)[0]:
+            self.__dict__.pop(field, None)
+
+    @property
+    def hour_distribution(self):
+        """Hour -> weight dict, as in TimestampGenerator.hour_distribution"""
+        return {int(h): float(w) for h, w in zip(self.hours, self.hour_weights)}
+
+    def steps_for_state(self, state):
+        """Step IDs belonging to a state index, in mapping order"""
+        if not 0 <= state < len(self.state_offsets) - 1:
+            return self.state_steps[:0]
+        return self.state_steps[self.state_offsets[state]:self.state_offsets[state + 1]]
+
+    def state_of_step(self, step_id):
+        """State index of a step ID, or None if unknown"""
+        idx = int(np.searchsorted(self.step_ids, step_id))
+        if idx < len(self.step_ids) and self.step_ids[idx] == step_id:
+            return int(self.step_states[idx])
+        return None
+
+    def sample_next_state(self, current_state, rng=np.random):
+        """
+        Draw the next state index from the transition CDF table
+
+        Uses NumPy's global generator by default, like UserAgent's local path,
+        so runs seeded with np.random.seed() stay reproducible.
+        """
+        row = self.transition_cdf[current_state]
+        return min(int(np.searchsorted(row, rng.random(), side='right')), len(row) - 1)
+
+    def close(self):
+        """Detach from shared memory"""
+        self._release_views()
+        del self._version_view
+        self._retired.extend(s for s in (self._segment, self._header) if s is not None)
+        self._close_retired()
+        self._segment = self._header = None
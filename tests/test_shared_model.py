@@ -0,0 +1,152 @@
+import multiprocessing as mp
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from shared_model import SharedModel, SharedModelPublisher
+from timestamp_generator import TimestampGenerator
+
+MATRIX = np.array([
+    [0.0, 0.5, 0.5],
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 0.0],
+])
+MAPPING = {0: [10, 11], 1: [12, 13], 2: [14]}
+
+
+def _watch_for_update(name, ready):
+    """Worker: attach, report, then poll between ticks until version 2 shows up"""
+    model = SharedModel(name)
+    first = (model.version, model.steps_for_state(1).tolist(), model.hour_distribution)
+    ready.set()
+    for _ in range(500):
+        if model.refresh():
+            break
+        time.sleep(0.01)
+    second = (model.version, model.steps_for_state(1).tolist(), model.state_of_step(14),
+              model.hour_distribution, model.transition_matrix.flags.writeable)
+    model.close()
+    return first, second
+
+
+@pytest.fixture
+def publisher():
+    with SharedModelPublisher() as pub:
+        pub.publish(MATRIX, MAPPING, {9: 1, 10: 3})
+        yield pub
+
+
+def test_lookups_and_cdf(publisher):
+    model = SharedModel(publisher.name)
+    try:
+        assert model.version == 1
+        assert model.steps_for_state(0).tolist() == [10, 11]
+        assert model.steps_for_state(7).tolist() == []
+        assert model.state_of_step(13) == 1
+        assert model.state_of_step(99) is None
+        # Empty row falls back to uniform
+        assert model.transition_cdf[2].tolist() == pytest.approx([1 / 3, 2 / 3, 1.0])
+        assert model.hour_cdf.tolist() == [0.25, 1.0]
+        with pytest.raises(ValueError):
+            model.transition_matrix[0, 0] = 1.0
+    finally:
+        model.close()
+
+
+def test_sampling_follows_numpy_seed(publisher):
+    model = SharedModel(publisher.name)
+    try:
+        np.random.seed(42)
+        first = [model.sample_next_state(0) for _ in range(20)]
+        np.random.seed(42)
+        second = [model.sample_next_state(0) for _ in range(20)]
+        assert first == second
+        assert set(first) <= {1, 2}
+    finally:
+        model.close()
+
+
+@pytest.mark.parametrize('start_method', ['fork', 'spawn'])
+def test_republish_reaches_worker_process(publisher, start_method):
+    ctx = mp.get_context(start_method)
+    with ctx.Manager() as manager, ctx.Pool(1) as pool:
+        ready = manager.Event()
+        result = pool.apply_async(_watch_for_update, (publisher.name, ready))
+        assert ready.wait(30)
+        publisher.publish(MATRIX * 2, {0: [10], 1: [13, 12], 2: [14]}, {15: 1})
+        first, second = result.get(30)
+
+    assert first == (1, [12, 13], {9: 1.0, 10: 3.0})
+    assert second == (2, [13, 12], 2, {15: 1.0}, False)
+
+
+def test_unrelated_process_does_not_unlink_model(publisher):
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "from shared_model import SharedModel; "
+        "m = SharedModel(sys.argv[2]); print(m.version); m.close()"
+    )
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, '-c', code, repo_root, publisher.name],
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '1'
+
+    # The segment must survive the other interpreter's exit
+    model = SharedModel(publisher.name)
+    assert model.version == 1
+    model.close()
+
+
+def test_timestamp_generator_follows_shared_hours(publisher):
+    model = SharedModel(publisher.name)
+    try:
+        generator = TimestampGenerator(datetime(2025, 5, 12), horizon=50, shared_model=model)
+        assert {t.hour for t in generator.timestamps} <= {9, 10}
+        issued = [generator.get_next_timestamp() for _ in range(5)]
+
+        publisher.publish(MATRIX, MAPPING, {15: 1})
+        assert model.refresh()
+        assert generator.refresh_distribution()
+        upcoming = generator.timestamps[generator.current_index:]
+
+        assert generator.timestamps[:5] == issued
+        assert upcoming and {t.hour for t in upcoming} == {15}
+        assert upcoming[0] > issued[-1]
+        assert len(generator.timestamps) >= generator.horizon
+
+        # Matrix-only republish leaves the timestamps alone
+        before = list(generator.timestamps)
+        publisher.publish(MATRIX * 2, MAPPING, {15: 1})
+        assert model.refresh()
+        assert not generator.refresh_distribution()
+        assert generator.timestamps == before
+    finally:
+        model.close()
+
+
+def test_republished_earlier_hours_roll_over_to_next_day():
+    with SharedModelPublisher() as pub:
+        pub.publish(MATRIX, MAPPING, {15: 1, 16: 1})
+        model = SharedModel(pub.name)
+        try:
+            generator = TimestampGenerator(datetime(2025, 5, 12), horizon=100, shared_model=model)
+            issued = [generator.get_next_timestamp() for _ in range(30)]
+
+            pub.publish(MATRIX, MAPPING, {9: 1, 10: 1})
+            assert model.refresh()
+            assert generator.refresh_distribution()
+
+            assert len(generator.timestamps) >= generator.horizon
+            assert generator.timestamps == sorted(generator.timestamps)
+            remaining = [generator.get_next_timestamp() for _ in range(generator.horizon - 30)]
+            assert remaining[0] > issued[-1]
+            assert remaining == sorted(remaining)
+            assert {t.hour for t in remaining} <= {9, 10}
+            assert all(t.date() > issued[-1].date() for t in remaining)
+        finally:
+            model.close()
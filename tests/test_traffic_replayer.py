@@ -0,0 +1,111 @@
+import socketserver
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from traffic_replayer import TrafficReplayer, percentile
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.paths.append(self.path)
+        body = b'ok'
+        self.send_response(404 if 'Missing' in self.path else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _GarbageHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.rfile.readline()
+        self.wfile.write(b'garbage\r\n')
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    server.paths = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _logs(urls, spacing_seconds=1):
+    start = datetime(2025, 5, 12, 10)
+    return [
+        {'timestamp': str(start + timedelta(seconds=i * spacing_seconds)), 'request_url': url, 'agent': 'UserAgent'}
+        for i, url in enumerate(urls)
+    ]
+
+
+def test_max_pacing_replays_all_requests(http_server):
+    urls = ['/Overview', '/Missing', '/Public Content'] * 10
+    replayer = TrafficReplayer(f'http://127.0.0.1:{http_server.server_port}/app', mode='max', pool_size=4)
+    summary = replayer.run(_logs(urls))
+
+    assert summary['requests'] == summary['completed'] == 30
+    assert summary['errors'] == 0
+    assert summary['status_counts'] == {200: 20, 404: 10}
+    assert '/app/Public%20Content' in http_server.paths
+    assert summary['p50_ms'] <= summary['p90_ms'] <= summary['p99_ms'] <= summary['max_ms']
+    assert summary['scheduled_p50_ms'] <= summary['scheduled_max_ms']
+
+
+def test_accelerated_pacing_follows_timestamps(http_server):
+    replayer = TrafficReplayer(f'http://127.0.0.1:{http_server.server_port}',
+                               mode='accelerated', speedup=20, pool_size=2)
+    started = time.monotonic()
+    summary = replayer.run(_logs(['/Overview'] * 11))
+    elapsed = time.monotonic() - started
+
+    # 10 seconds of log time compressed 20x
+    assert 0.45 <= elapsed < 2.0
+    assert summary['completed'] == 11
+    assert summary['send_lag_max_ms'] is not None
+    # Schedule-corrected latency includes the service time plus any send lag
+    assert summary['scheduled_p50_ms'] >= summary['p50_ms']
+    assert summary['scheduled_max_ms'] >= summary['max_ms']
+
+
+def test_malformed_response_is_counted_as_error():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _GarbageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        replayer = TrafficReplayer(f'http://127.0.0.1:{server.server_address[1]}', mode='max', pool_size=2)
+        summary = replayer.run(_logs(['/Overview'] * 3))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert summary['errors'] == 3
+    assert summary['completed'] == 0
+    assert summary['p50_ms'] is None
+    assert summary['scheduled_p50_ms'] is None
+
+
+def test_control_characters_are_not_injected(http_server):
+    replayer = TrafficReplayer(f'http://127.0.0.1:{http_server.server_port}', mode='max', pool_size=1)
+    summary = replayer.run(_logs(['/Overview\r\nX-Injected: 1']))
+
+    assert summary['status_counts'] == {200: 1}
+    assert http_server.paths == ['/Overview%0D%0AX-Injected%3A%201']
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7], 95) == 7
+    with pytest.raises(ValueError):
+        percentile([], 50)
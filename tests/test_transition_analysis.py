@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from transition_analysis import (
+    analyze_transition_matrix,
+    diagnose_matrix,
+    expected_hitting_steps,
+    expected_visit_share,
+    normalize_matrix,
+    stationary_distribution,
+)
+
+STATES = [
+    'Start', 'PublicContent', 'LoginProcess', 'Overview', 'WatchList',
+    'TradingRelated', 'Account', 'Messages', 'PrivateData', 'Blog', 'Search'
+]
+
+# Example matrix from UserAgent
+USER_AGENT_MATRIX = np.array([
+    [0.00, 0.80, 0.20, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.10, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.30, 0.60],
+    [0.30, 0.00, 0.00, 0.70, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.20, 0.00, 0.00, 0.30, 0.30, 0.20, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 1.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 1.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 0.20, 0.00, 0.00, 0.00, 0.40, 0.40, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 1.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 1.00, 0.00, 0.00, 0.00, 0.00],
+    [0.00, 0.70, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.30, 0.00],
+    [0.00, 0.60, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.40],
+])
+
+
+def test_stationary_distribution_is_invariant():
+    pi = stationary_distribution(USER_AGENT_MATRIX)
+    assert pi.sum() == pytest.approx(1.0)
+    assert np.all(pi >= 0)
+    np.testing.assert_allclose(pi @ USER_AGENT_MATRIX, pi, atol=1e-10)
+
+
+def test_visit_share_converges_to_stationary():
+    pi = stationary_distribution(USER_AGENT_MATRIX)
+    np.testing.assert_allclose(expected_visit_share(USER_AGENT_MATRIX, STATES), pi)
+    long_run = expected_visit_share(USER_AGENT_MATRIX, STATES, horizon=5000)
+    np.testing.assert_allclose(long_run, pi, atol=1e-2)
+
+
+def test_hitting_time_closed_form():
+    # Two-state chain: leave A with probability p, so E[steps A -> B] = 1 / p
+    p = 0.25
+    matrix = [[1 - p, p], [0.5, 0.5]]
+    assert expected_hitting_steps(matrix, ['A', 'B'], 'A', 'B') == pytest.approx(1 / p)
+    assert expected_hitting_steps(matrix, ['A', 'B'], 'B', 'B') == 0.0
+
+
+def test_hitting_time_matches_monte_carlo():
+    steps = expected_hitting_steps(USER_AGENT_MATRIX, STATES, 'Start', 'PrivateData')
+    rng = np.random.default_rng(0)
+    walks = []
+    for _ in range(2000):
+        state, count = 0, 0
+        while state != 8:
+            state = rng.choice(11, p=USER_AGENT_MATRIX[state])
+            count += 1
+        walks.append(count)
+    assert steps == pytest.approx(97.82, abs=0.01)
+    assert np.mean(walks) == pytest.approx(steps, rel=0.08)
+
+
+def test_hitting_time_is_infinite_when_walk_can_be_trapped():
+    # B is absorbing and never leads to C, so the walk from A may never reach C
+    matrix = [[0.0, 0.5, 0.5], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0]]
+    assert expected_hitting_steps(matrix, ['A', 'B', 'C'], 'A', 'C') == np.inf
+    # Unreachable target
+    matrix = [[0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+    assert expected_hitting_steps(matrix, ['A', 'B', 'C'], 'A', 'C') == np.inf
+
+
+def test_empty_rows_are_uniform():
+    normalized = normalize_matrix([[0.0, 2.0], [0.0, 0.0]])
+    np.testing.assert_allclose(normalized, [[0.0, 1.0], [0.5, 0.5]])
+
+
+def test_unknown_states_are_rejected():
+    with pytest.raises(ValueError, match="Unknown state"):
+        expected_hitting_steps(USER_AGENT_MATRIX, STATES, 'Nowhere', 'PrivateData')
+    for index in (-1, len(STATES)):
+        with pytest.raises(ValueError, match="Unknown state"):
+            expected_hitting_steps(USER_AGENT_MATRIX, STATES, index, 'PrivateData')
+
+
+def test_diagnose_matrix():
+    states = ['Start', 'A', 'B', 'C', 'D']
+    matrix = np.array([
+        [0.0, 0.5, 0.5, 0.0, 0.0],  # Start -> A, B
+        [0.5, 0.0, 0.0, 0.0, 0.0],  # A sums to 0.5
+        [0.0, 0.0, 1.0, 0.0, 0.0],  # B absorbing
+        [0.0, 0.0, 0.0, 0.0, 0.0],  # C empty (uniform) and never entered
+        [0.0, 0.0, 0.0, 0.0, 0.0],  # D empty too
+    ])
+    diagnostics = diagnose_matrix(matrix, states)
+
+    assert diagnostics['empty_rows'] == ['C', 'D']
+    assert diagnostics['unnormalized_rows'] == ['A']
+    assert diagnostics['absorbing_states'] == ['B']
+    assert diagnostics['unreachable_states'] == ['C', 'D']
+    assert diagnostics['cannot_return_to_start'] == ['B']
+    assert diagnostics['irreducible'] is False
+
+    assert diagnose_matrix(USER_AGENT_MATRIX, STATES) == {
+        'empty_rows': [],
+        'unnormalized_rows': [],
+        'absorbing_states': [],
+        'unreachable_states': [],
+        'cannot_return_to_start': [],
+        'irreducible': True,
+    }
+
+
+def test_analyze_transition_matrix_summary():
+    analysis = analyze_transition_matrix(USER_AGENT_MATRIX, STATES, horizon=100)
+    assert set(analysis) == {'stationary_distribution', 'visit_share', 'hitting_steps', 'diagnostics'}
+    assert sum(analysis['visit_share'].values()) == pytest.approx(1.0)
+    assert analysis['hitting_steps']['PrivateData'] == pytest.approx(97.82, abs=0.01)
+    assert analysis['diagnostics']['irreducible'] is True
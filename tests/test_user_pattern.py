@@ -0,0 +1,82 @@
+import csv
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import user_pattern
+
+# Two sessions separated by more than the default 30 minute gap
+SESSIONS = [
+    ['/public/start', '/blog/post', '/search?q=abc', '/basic/login', '/overview', '/account', '/private/kyc'],
+    ['/public/start', '/basic/login', '/overview', '/watchlist', '/overview', '/account', '/messages'],
+]
+
+
+@pytest.fixture
+def log_csv(tmp_path):
+    path = tmp_path / 'log.csv'
+    timestamp = datetime(2025, 5, 12, 9)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['timestamp', 'httpRequest.requestUrl', 'httpRequest.requestMethod'])
+        for urls in SESSIONS:
+            for url in urls:
+                timestamp += timedelta(minutes=1)
+                writer.writerow([timestamp.isoformat(), url, 'GET'])
+            timestamp += timedelta(hours=2)
+    return str(path)
+
+
+def test_json_output(log_csv, capsys):
+    assert user_pattern.main([log_csv, '--format', 'json']) == 0
+    result = json.loads(capsys.readouterr().out)
+
+    states = result['states']
+    matrix = result['transition_matrix']
+    assert states[0] == 'Start' and len(states) == len(matrix) == 11
+    # Both sessions open on public content
+    assert matrix[0][states.index('PublicContent')] == 1.0
+    for row in matrix:
+        assert sum(row) == pytest.approx(1.0) or sum(row) == 0
+
+
+def test_csv_output_to_file(log_csv, tmp_path, capsys):
+    output = tmp_path / 'matrix.csv'
+    assert user_pattern.main([log_csv, log_csv, '--format', 'csv', '-o', str(output)]) == 0
+    assert capsys.readouterr().out == ''
+
+    with open(output) as f:
+        rows = list(csv.reader(f))
+    assert rows[0][0] == 'from_state' and rows[0][1:] == [row[0] for row in rows[1:]]
+    assert len(rows) == 12
+
+
+def test_output_requires_machine_format(log_csv, tmp_path):
+    with pytest.raises(SystemExit):
+        user_pattern.main([log_csv, '-o', str(tmp_path / 'matrix.txt')])
+
+
+def test_stats_keeps_stdout_parseable(log_csv, capsys):
+    assert user_pattern.main([log_csv, '--format', 'json', '--stats']) == 0
+    captured = capsys.readouterr()
+    json.loads(captured.out)
+    assert 'Expected steps from start' in captured.err
+    assert 'PrivateData' in captured.err
+
+
+def test_heatmap_written_to_file(log_csv, tmp_path):
+    image = tmp_path / 'heatmap.png'
+    assert user_pattern.main([log_csv, '--format', 'json', '--heatmap', str(image)]) == 0
+    assert image.stat().st_size > 0
+
+
+def test_heatmap_and_show_are_exclusive(log_csv, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        user_pattern.main([log_csv, '--heatmap', str(tmp_path / 'heatmap.png'), '--show'])
+    assert 'not allowed with' in capsys.readouterr().err
+
+
+def test_missing_input_reports_error(tmp_path, capsys):
+    assert user_pattern.main([str(tmp_path / 'missing.csv'), '--format', 'json']) == 1
+    assert 'Error' in capsys.readouterr().err
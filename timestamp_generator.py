@@ -1,16 +1,18 @@
 import random
+from bisect import bisect_right
 from datetime import datetime, timedelta
 
 class TimestampGenerator:
     """Generate timestamps for simulation logs based on horizon parameter"""
     
-    def __init__(self, target_date=None, horizon=100):
+    def __init__(self, target_date=None, horizon=100, shared_model=None):
         """
         Initialize the timestamp generator
         
         Args:
             target_date (datetime): Starting date (default: today)
             horizon (int): Number of steps in the simulation
+            shared_model (SharedModel): Draw hours from its shared hour CDF instead of the local distribution
         """
         # Set target date (default to today)
         self.target_date = target_date or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -35,6 +37,10 @@ class TimestampGenerator:
         self.logs_per_step = 1
         self.total_logs = self.horizon * self.logs_per_step
         
+        # Hours come from the shared hours/hour_cdf tables when attached
+        self.shared_model = shared_model
+        self._shared_hour_table = self._hour_table_key()
+        
         # distribution from analysis 
         self.hour_distribution = {
             7: 57,    # 7 AM
@@ -56,10 +62,30 @@ class TimestampGenerator:
         self.step_to_timestamp = {}
         self._map_steps_to_timestamps()
     
+    def _draw_hour(self):
+        """Draw a single hour from the distribution"""
+        if self.shared_model is not None:
+            cdf = self.shared_model.hour_cdf
+            idx = min(bisect_right(cdf, random.random()), len(cdf) - 1)
+            return int(self.shared_model.hours[idx])
+        return random.choice(list(self.hour_distribution.keys()))
+    
+    def _hours_for_day(self, day_logs):
+        """Return the hour of each log generated for one day"""
+        if self.shared_model is not None:
+            return [self._draw_hour() for _ in range(day_logs)]
+        
+        total_distribution = sum(self.hour_distribution.values())
+        hours = []
+        for hour, count in self.hour_distribution.items():
+            # Scale by total_logs / total_distribution
+            scaled_count = max(1, int((count / total_distribution) * day_logs))
+            hours.extend([hour] * scaled_count)
+        return hours
+    
     def _generate_all_timestamps(self):
         """Generate all timestamps based on distribution"""
         all_timestamps = []
-        total_distribution = sum(self.hour_distribution.values())
         
         # Calculate logs per day
         logs_per_day = self.total_logs // self.simulation_days
@@ -74,27 +100,22 @@ class TimestampGenerator:
             else:
                 day_logs = logs_per_day
             
-            # For each hour in the distribution
-            for hour, count in self.hour_distribution.items():
-                # Scale by total_logs / total_distribution
-                scaled_count = max(1, int((count / total_distribution) * day_logs))
+            # Generate one timestamp per drawn hour
+            for hour in self._hours_for_day(day_logs):
+                # Random minute and second
+                minute = random.randint(0, 59)
+                second = random.randint(0, 59)
+                microsecond = random.randint(0, 999999)
+                
+                # Create timestamp
+                timestamp = datetime(
+                    target_date.year,
+                    target_date.month,
+                    target_date.day,
+                    hour, minute, second, microsecond
+                )
                 
-                # Generate timestamps for this hour
-                for _ in range(scaled_count):
-                    # Random minute and second
-                    minute = random.randint(0, 59)
-                    second = random.randint(0, 59)
-                    microsecond = random.randint(0, 999999)
-                    
-                    # Create timestamp
-                    timestamp = datetime(
-                        target_date.year,
-                        target_date.month,
-                        target_date.day,
-                        hour, minute, second, microsecond
-                    )
-                    
-                    all_timestamps.append(timestamp)
+                all_timestamps.append(timestamp)
         
         # Sort all timestamps
         all_timestamps.sort()
@@ -103,7 +124,7 @@ class TimestampGenerator:
         while len(all_timestamps) < self.horizon:
             # Add more timestamps if needed
             last_date = self.target_date + timedelta(days=self.simulation_days-1)
-            hour = random.choice(list(self.hour_distribution.keys()))
+            hour = self._draw_hour()
             minute = random.randint(0, 59)
             second = random.randint(0, 59)
             microsecond = random.randint(0, 999999)
@@ -136,6 +157,59 @@ class TimestampGenerator:
             for step, idx in enumerate(indices):
                 self.step_to_timestamp[step] = self.timestamps[min(idx, len(self.timestamps)-1)]
     
+    def _hour_table_key(self):
+        """Fingerprint of the shared hour table, used only to detect republished hours"""
+        if self.shared_model is None:
+            return None
+        return self.shared_model.hours.tobytes() + self.shared_model.hour_cdf.tobytes()
+    
+    def refresh_distribution(self):
+        """
+        Regenerate upcoming timestamps after the shared hour distribution changed
+        
+        Returns:
+            bool: True if the timestamps were regenerated
+        """
+        key = self._hour_table_key()
+        if key == self._shared_hour_table:
+            # Matrix-only update, the hours did not change
+            return False
+        self._shared_hour_table = key
+        
+        # Keep what has already been handed out so logs stay in time order
+        issued = self.timestamps[:self.current_index]
+        if not issued:
+            self.timestamps = self._generate_all_timestamps()
+        else:
+            self.timestamps = issued + self._generate_after(issued[-1], max(self.horizon - len(issued), 1))
+        self.step_to_timestamp = {}
+        self._map_steps_to_timestamps()
+        return True
+    
+    def _generate_after(self, last_issued, count):
+        """Generate count sorted timestamps strictly after last_issued"""
+        # Spread over the days left in the simulation, at least the current one
+        last_day = self.target_date + timedelta(days=self.simulation_days - 1)
+        first_day = datetime(last_issued.year, last_issued.month, last_issued.day)
+        days_left = max(1, (last_day.date() - first_day.date()).days + 1)
+        
+        timestamps = []
+        for i in range(count):
+            day = first_day + timedelta(days=i * days_left // count)
+            timestamp = day.replace(
+                hour=self._draw_hour(),
+                minute=random.randint(0, 59),
+                second=random.randint(0, 59),
+                microsecond=random.randint(0, 999999)
+            )
+            # Hours already past on the current day roll over to the next day
+            if timestamp <= last_issued:
+                timestamp += timedelta(days=1)
+            timestamps.append(timestamp)
+        
+        timestamps.sort()
+        return timestamps
+    
     def get_timestamp_for_step(self, step):
         """Get timestamp for a specific simulation step"""
         if step in self.step_to_timestamp:
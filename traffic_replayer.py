@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import ssl
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+logger = logging.getLogger(__name__)
+
+PACING_MODES = ('realtime', 'accelerated', 'max')
+# Seconds a send may trail its scheduled time before the summary warns about it
+SCHEDULE_LAG_WARNING = 0.1
+
+
+class _Connection:
+    """Single keep-alive HTTP/1.1 connection owned by one replay worker"""
+
+    def __init__(self, host, port, use_ssl, timeout):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl.create_default_context() if use_ssl else None
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def _open(self):
+        self.reader, self.writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl_context),
+            self.timeout
+        )
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        self.reader = self.writer = None
+
+    async def get(self, path, host_header):
+        """Send a GET request and return the response status code"""
+        # A pooled connection may have been closed by the server while idle,
+        # so retry once on a fresh connection before reporting the failure
+        for attempt in range(2):
+            fresh = self.writer is None
+            if fresh:
+                await self._open()
+            try:
+                return await asyncio.wait_for(self._exchange(path, host_header), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if fresh or attempt == 1:
+                    raise
+            except BaseException:
+                await self.close()
+                raise
+
+    async def _exchange(self, path, host_header):
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "User-Agent: MAL-UserSimulator-Replayer\r\n"
+            "Connection: keep-alive\r\n"
+            "\r\n"
+        )
+        self.writer.write(request.encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        parts = status_line.split()
+        if len(parts) < 2 or not parts[0].startswith(b'HTTP/') or not parts[1].isdigit():
+            raise ValueError(f"Malformed status line: {status_line[:80]!r}")
+        status = int(parts[1])
+
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        # Drain the body so the connection can be reused
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif status >= 200 and status not in (204, 304):
+            await self.reader.read()
+            await self.close()
+            return status
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status
+
+
+class TrafficReplayer:
+    """Replay UserAgent trajectories as HTTP traffic against a target application"""
+
+    def __init__(self, base_url, mode='realtime', speedup=1.0, pool_size=10, timeout=10.0):
+        """
+        Initialize the replayer
+
+        Args:
+            base_url (str): Application root the request_url paths are appended to
+            mode (str): 'realtime', 'accelerated' (timestamps compressed by speedup) or 'max'
+            speedup (float): Acceleration factor used in 'accelerated' mode
+            pool_size (int): Number of pooled keep-alive connections
+            timeout (float): Per-request timeout in seconds
+        """
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode '{mode}', expected one of {PACING_MODES}")
+        if mode == 'accelerated' and speedup <= 0:
+            raise ValueError("speedup must be positive")
+
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme in '{base_url}'")
+        self.use_ssl = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.use_ssl else 80)
+        self.host_header = parts.netloc
+        self.base_path = parts.path.rstrip('/')
+
+        self.mode = mode
+        self.speedup = float(speedup) if mode == 'accelerated' else 1.0
+        self.pool_size = max(1, int(pool_size))
+        self.timeout = timeout
+
+    @staticmethod
+    def load_logs(file_path='user_logs.json'):
+        """Load logs written by UserAgent.terminate()"""
+        with open(file_path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _parse_timestamp(value):
+        if isinstance(value, datetime):
+            return value
+        return datetime.fromisoformat(str(value))
+
+    def _schedule(self, logs):
+        """Return (offset_seconds, path) pairs ordered by timestamp"""
+        events = sorted(
+            (self._parse_timestamp(entry['timestamp']), entry['request_url'])
+            for entry in logs
+        )
+        if not events:
+            return []
+        start = events[0][0]
+        return [
+            ((timestamp - start).total_seconds() / self.speedup,
+             quote(self.base_path + url, safe="/?=&%"))
+            for timestamp, url in events
+        ]
+
+    async def _worker(self, queue, results):
+        connection = _Connection(self.host, self.port, self.use_ssl, self.timeout)
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                scheduled, path = item
+                sent = loop.time()
+                # Max mode has no schedule, so the send time stands in for it
+                if scheduled is None:
+                    scheduled = sent
+                results['send_lags'].append(sent - scheduled)
+                try:
+                    status = await connection.get(path, self.host_header)
+                    finished = loop.time()
+                    # Service time, plus the time from the scheduled send so a
+                    # saturated pool shows up instead of silently delaying the schedule
+                    results['latencies'].append(finished - sent)
+                    results['scheduled_latencies'].append(finished - scheduled)
+                    results['status_counts'][status] = results['status_counts'].get(status, 0) + 1
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                    results['errors'] += 1
+                    logger.debug("Request %s failed: %s", path, e)
+        finally:
+            await connection.close()
+
+    async def replay(self, logs):
+        """Issue one GET per log entry, paced by the generated timestamps"""
+        schedule = self._schedule(logs)
+        results = {'latencies': [], 'scheduled_latencies': [], 'send_lags': [],
+                   'status_counts': {}, 'errors': 0}
+        queue = asyncio.Queue(maxsize=self.pool_size * 2)
+        workers = [asyncio.create_task(self._worker(queue, results)) for _ in range(self.pool_size)]
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for offset, path in schedule:
+            scheduled = None
+            if self.mode != 'max':
+                scheduled = started + offset
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await queue.put((scheduled, path))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+        return self._summarize(results, len(schedule), loop.time() - started)
+
+    def run(self, logs):
+        """Synchronous wrapper around replay()"""
+        return asyncio.run(self.replay(logs))
+
+    @staticmethod
+    def _summarize(results, total, elapsed):
+        latencies = sorted(results['latencies'])
+        summary = {
+            'requests': total,
+            'completed': len(latencies),
+            'errors': results['errors'],
+            'status_counts': results['status_counts'],
+            'elapsed_seconds': elapsed,
+            'throughput_rps': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        }
+        # Per-request service latency, measured from the actual send
+        summary.update(_percentiles(latencies, ''))
+        # Latency measured from the scheduled send time (equal to the above in max mode)
+        summary.update(_percentiles(sorted(results['scheduled_latencies']), 'scheduled_'))
+
+        # How far sends fell behind the timestamp schedule (always 0 in max mode)
+        lags = sorted(results['send_lags'])
+        summary['send_lag_p50_ms'] = percentile(lags, 50) * 1000 if lags else None
+        summary['send_lag_p99_ms'] = percentile(lags, 99) * 1000 if lags else None
+        summary['send_lag_max_ms'] = lags[-1] * 1000 if lags else None
+        if lags and lags[-1] > SCHEDULE_LAG_WARNING:
+            logger.warning("Sends lagged up to %.0f ms behind schedule; consider a larger pool",
+                           lags[-1] * 1000)
+        return summary
+
+
+def _percentiles(sorted_values, prefix):
+    """p50/p90/p95/p99/max of sorted seconds, in milliseconds"""
+    summary = {}
+    for p in (50, 90, 95, 99):
+        summary[f'{prefix}p{p}_ms'] = percentile(sorted_values, p) * 1000 if sorted_values else None
+    summary[f'{prefix}max_ms'] = sorted_values[-1] * 1000 if sorted_values else None
+    return summary
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        raise ValueError("percentile of empty sequence")
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay UserAgent logs as HTTP traffic")
+    parser.add_argument('base_url', help="Target application root, e.g. http://localhost:8000")
+    parser.add_argument('--logs', default='user_logs.json', help="Log file written by UserAgent")
+    parser.add_argument('--mode', choices=PACING_MODES, default='realtime')
+    parser.add_argument('--speedup', type=float, default=60.0, help="Factor for accelerated mode")
+    parser.add_argument('--pool-size', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args()
+
+    replayer = TrafficReplayer(args.base_url, mode=args.mode, speedup=args.speedup,
+                               pool_size=args.pool_size, timeout=args.timeout)
+    summary = replayer.run(replayer.load_logs(args.logs))
+    print(json.dumps(summary, indent=2, default=str))
@@ -0,0 +1,174 @@
+import numpy as np
+from collections import deque
+
+
+def normalize_matrix(matrix):
+    """
+    Return a row-stochastic copy of the transition matrix
+
+    Rows without any transitions are replaced by a uniform row, which is how
+    UserAgent picks the next state when a row sums to zero.
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"Transition matrix must be square, got shape {matrix.shape}")
+    n = matrix.shape[0]
+    row_sums = matrix.sum(axis=1, keepdims=True)
+    empty = row_sums[:, 0] == 0
+    normalized = np.divide(matrix, row_sums, out=np.zeros_like(matrix), where=row_sums != 0)
+    normalized[empty] = 1.0 / n
+    return normalized
+
+
+def _state_index(states, state):
+    if isinstance(state, (int, np.integer)):
+        if not 0 <= state < len(states):
+            raise ValueError(f"Unknown state '{state}'")
+        return int(state)
+    try:
+        return states.index(state)
+    except ValueError:
+        raise ValueError(f"Unknown state '{state}'") from None
+
+
+def _reachable(matrix, sources, reverse=False):
+    """Indices reachable from any of sources following non-zero edges"""
+    adjacency = matrix.T if reverse else matrix
+    seen = set(sources)
+    queue = deque(sources)
+    while queue:
+        i = queue.popleft()
+        for j in np.flatnonzero(adjacency[i]):
+            j = int(j)
+            if j not in seen:
+                seen.add(j)
+                queue.append(j)
+    return seen
+
+
+def stationary_distribution(matrix):
+    """
+    Long-run fraction of steps spent in each state
+
+    Solves pi P = pi with sum(pi) = 1. For chains that are not irreducible the
+    distribution is not unique; check diagnose_matrix() before relying on it.
+    """
+    P = normalize_matrix(matrix)
+    n = P.shape[0]
+    A = np.vstack([P.T - np.eye(n), np.ones(n)])
+    b = np.zeros(n + 1)
+    b[-1] = 1.0
+    pi = np.linalg.lstsq(A, b, rcond=None)[0]
+    pi = np.clip(pi, 0.0, None)
+    return pi / pi.sum()
+
+
+def expected_visit_share(matrix, states, start='Start', horizon=None):
+    """
+    Expected share of page views per state for a walk beginning at start
+
+    With horizon=None this is the stationary distribution. With a horizon it is
+    the mean occupancy over steps 1..horizon, matching a UserAgent run of that
+    many steps (the starting state itself is not counted as a view).
+    """
+    if horizon is None:
+        return stationary_distribution(matrix)
+    P = normalize_matrix(matrix)
+    dist = np.zeros(P.shape[0])
+    dist[_state_index(states, start)] = 1.0
+    visits = np.zeros_like(dist)
+    for _ in range(int(horizon)):
+        dist = dist @ P
+        visits += dist
+    return visits / visits.sum()
+
+
+def expected_hitting_steps(matrix, states, start='Start', target='PrivateData'):
+    """
+    Expected number of steps to first reach target (a state or list of states)
+
+    Returns numpy.inf when target cannot be reached from start, or when the walk
+    can get trapped somewhere it never reaches target from.
+    """
+    P = normalize_matrix(matrix)
+    n = P.shape[0]
+    targets = [target] if isinstance(target, (str, int, np.integer)) else list(target)
+    target_idx = {_state_index(states, t) for t in targets}
+    start_idx = _state_index(states, start)
+    if start_idx in target_idx:
+        return 0.0
+
+    # Only states that reach target with probability one have finite hitting times
+    can_reach = _reachable(P, list(target_idx), reverse=True)
+    finite = set(can_reach)
+    changed = True
+    while changed:
+        changed = False
+        for i in list(finite - target_idx):
+            if any(P[i, j] > 0 and j not in finite for j in range(n)):
+                finite.discard(i)
+                changed = True
+    if start_idx not in finite:
+        return np.inf
+
+    # Solve (I - Q) h = 1 over the transient states
+    transient = sorted(finite - target_idx)
+    Q = P[np.ix_(transient, transient)]
+    h = np.linalg.solve(np.eye(len(transient)) - Q, np.ones(len(transient)))
+    return float(h[transient.index(start_idx)])
+
+
+def diagnose_matrix(matrix, states, start='Start'):
+    """Report structural problems in a fitted transition matrix"""
+    raw = np.asarray(matrix, dtype=float)
+    P = normalize_matrix(raw)
+    start_idx = _state_index(states, start)
+    reachable = _reachable(P, [start_idx])
+
+    row_sums = raw.sum(axis=1)
+    return {
+        'empty_rows': [states[i] for i in np.flatnonzero(row_sums == 0)],
+        'unnormalized_rows': [states[i] for i in np.flatnonzero((row_sums != 0) & ~np.isclose(row_sums, 1.0))],
+        'absorbing_states': [states[i] for i in range(len(states)) if np.isclose(P[i, i], 1.0)],
+        'unreachable_states': [states[i] for i in range(len(states)) if i not in reachable],
+        'cannot_return_to_start': [
+            states[i] for i in sorted(reachable)
+            if i != start_idx and start_idx not in _reachable(P, [i])
+        ],
+        'irreducible': len(reachable) == len(states) and all(
+            start_idx in _reachable(P, [i]) for i in range(len(states))
+        ),
+    }
+
+
+def analyze_transition_matrix(matrix, states, start='Start', targets=('PrivateData', 'Messages'), horizon=None):
+    """
+    Analytical summary of a transition matrix from analyze_logical_transitions
+
+    Returns the stationary distribution, expected page-view share, expected
+    steps from start to each target and structural diagnostics.
+    """
+    states = list(states)
+    stationary = stationary_distribution(matrix)
+    share = expected_visit_share(matrix, states, start, horizon) if horizon else stationary
+    return {
+        'stationary_distribution': dict(zip(states, stationary.tolist())),
+        'visit_share': dict(zip(states, share.tolist())),
+        'hitting_steps': {
+            target: expected_hitting_steps(matrix, states, start, target) for target in targets
+        },
+        'diagnostics': diagnose_matrix(matrix, states, start),
+    }
+
+
+def print_analysis(analysis):
+    """Print the result of analyze_transition_matrix()"""
+    print("\nState          Stationary   Visit share")
+    for state, pi in analysis['stationary_distribution'].items():
+        print(f"  {state:<14} {pi:>8.3f}   {analysis['visit_share'][state]:>8.3f}")
+    print("\nExpected steps from start:")
+    for target, steps in analysis['hitting_steps'].items():
+        print(f"  → {target}: {steps:.2f}")
+    print("\nDiagnostics:")
+    for key, value in analysis['diagnostics'].items():
+        print(f"  {key}: {value}")
@@ -5,6 +5,7 @@ import json
 import numpy as np
 import re
 from libexec.userAgent.timestamp_generator import TimestampGenerator
+from libexec.userAgent.shared_model import SharedModel
 from datetime import datetime
 from collections import defaultdict
 
@@ -33,6 +34,9 @@ class UserAgent:
         self.steps_name = {}
         # Current step being executed
         self.current_step = 0
+        # Optional model shared between worker processes (see shared_model.py)
+        shared_model_name = agent_config.get('shared_model')
+        self.shared_model = SharedModel(shared_model_name) if shared_model_name else None
        
         
         # Transition matrix defining probability of moving between states
@@ -55,15 +59,22 @@ class UserAgent:
             [0.00, 0.60, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 0.40]   # Search -> [PublicContent, Search]
         ])
         
+        if self.shared_model is not None:
+            # Use the zero-copy shared matrix instead of the local example
+            self.transition_matrix = self.shared_model.transition_matrix
+
         #Process attack graph to populate mappings
         self.utilize_states_steps(self.attack_graph)
         
         # Set up timestamp generator
         target_date = agent_config.get('target_date', datetime(2025, 5, 12))  # this date can be changed
-        self.timestamp_generator = TimestampGenerator(target_date) 
+        self.timestamp_generator = TimestampGenerator(target_date, shared_model=self.shared_model) 
         
         print(f"Agent initialized with timestamps for {target_date.strftime('%Y-%m-%d')}")
-        print(f"States mapping: {dict(self.mapping)}")
+        if self.shared_model is not None:
+            print(f"Attached to shared model {self.shared_model.name} version {self.shared_model.version}")
+        else:
+            print(f"States mapping: {dict(self.mapping)}")
     
     def utilize_states_steps(self, attack_graph: AttackGraphNode):
         """Utilize states and steps from the attack graph."""
@@ -74,6 +85,9 @@ class UserAgent:
             # state.lg_attack_step.name with the attack step name
             if node not in self.steps_name:
                 self.steps_name[node] = state.lg_attack_step.name
+            # state-to-step mapping is held by the shared model when attached
+            if self.shared_model is not None:
+                continue
             # state.model_asset.id with the attack step ids
             if not state.model_asset.id in self.mapping:
                 if node not in self.mapping[state.model_asset.id]:
@@ -86,6 +100,8 @@ class UserAgent:
 
     def get_state_from_step(self, step_id):
         """Get the state corresponding to a given step ID."""
+        if self.shared_model is not None:
+            return self.shared_model.state_of_step(step_id)
         for state_id, steps in self.mapping.items():
             if step_id in steps:
                 return state_id
@@ -94,6 +110,10 @@ class UserAgent:
             
     def get_next_state_id_based_transition_matrix(self, current_state):
         """Return the next state ID based on the transition matrix."""
+        if self.shared_model is not None:
+            next_state_idx = self.shared_model.sample_next_state(current_state)
+            print(f"Next state index based on shared transition matrix: {next_state_idx}")
+            return next_state_idx
         row = self.transition_matrix[current_state]
         # Check if row has any non-zero values / shouldnt has
         if np.sum(row) == 0:
@@ -130,6 +150,13 @@ class UserAgent:
     def get_next_action(self, agent_state: MalSimAgentStateView, **kwargs):
         """Choose an action based on transition matrix priorities."""
         try:
+            # Pick up a republished shared model between ticks
+            if self.shared_model is not None and self.shared_model.refresh():
+                self.transition_matrix = self.shared_model.transition_matrix
+                # Only regenerates timestamps when the hour table itself changed
+                self.timestamp_generator.refresh_distribution()
+                print(f"Switched to shared model version {self.shared_model.version}")
+
             # Get available attack steps from action surface
             attack_surface = list(agent_state.action_surface)
             
@@ -151,7 +178,10 @@ class UserAgent:
             next_state_idx = self.get_next_state_id_based_transition_matrix(self.current_state_idx)
             
             # Get steps for the chosen state
-            if self.mapping:
+            if self.shared_model is not None:
+                state_steps = [int(step) for step in self.shared_model.steps_for_state(next_state_idx)]
+                print(f"State_steps {state_steps}")
+            elif self.mapping:
                 state_steps = self.mapping[next_state_idx]
                 print(f"State_steps {state_steps}")
             else: 
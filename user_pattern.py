@@ -1,14 +1,26 @@
-import pandas as pd
-import numpy as np
+import argparse
+import contextlib
+import json
+import sys
 from collections import defaultdict
-import matplotlib.pyplot as plt
 
+# pandas, NumPy and matplotlib are imported inside the functions that need them
+# so importing this module (or running --help) stays cheap
 
-def analyze_logical_transitions(file_path, session_gap_minutes=30):
+
+def analyze_logical_transitions(file_path, session_gap_minutes=30, verbose=True):
     """
     Analyze transitions
+
+    file_path may be a single CSV path or a list of paths that are combined
+    into one log before sessions are identified.
     """
-    print(f"Analyzing log data from: {file_path}")
+    import numpy as np
+    import pandas as pd
+
+    file_paths = [file_path] if isinstance(file_path, str) else list(file_path)
+    if verbose:
+        print(f"Analyzing log data from: {', '.join(file_paths)}")
     
     # Define our states in the exact order from the structure
     states = [
@@ -36,7 +48,7 @@ def analyze_logical_transitions(file_path, session_gap_minutes=30):
     }
     
     # Load data
-    df = pd.read_csv(file_path)
+    df = pd.concat([pd.read_csv(path) for path in file_paths], ignore_index=True)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df.sort_values('timestamp', inplace=True)
     
@@ -159,6 +171,13 @@ def analyze_logical_transitions(file_path, session_gap_minutes=30):
                 count = all_logical_transitions.get((from_state, to_state), 0)
                 matrix[i, j] = count / total
     
+    if verbose:
+        print_transition_report(matrix, states, all_logical_transitions)
+
+    return matrix, states, all_logical_transitions
+
+def print_transition_report(matrix, states, all_logical_transitions):
+    """Print per-state transition counts and the matrix as Python source"""
     # Analyze transitions from each state
     for state in states:
         print(f"\nLogical transitions from {state}:")
@@ -187,10 +206,29 @@ def analyze_logical_transitions(file_path, session_gap_minutes=30):
         print("    [" + ", ".join(f"{matrix[i, j]:.2f}" for j in range(len(states))) + "],")
     print("])")
 
+def plot_heatmap(matrix, states, output_path=None):
+    """Draw the transition matrix; save to output_path or show interactively"""
+    import matplotlib
+    if output_path:
+        # Headless backend so no display is required when writing to a file
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
 
-    # Print the transition matrix
-    
-    return matrix, states, all_logical_transitions
+    plt.figure(figsize=(10, 8))
+    plt.imshow(matrix, cmap='YlGnBu', interpolation='nearest')
+    plt.gca().set_facecolor('white')   # axes background
+    plt.gcf().set_facecolor('white')   # figure background
+    plt.colorbar()
+    plt.xticks(range(len(states)), states, rotation=45, ha='right')
+    plt.yticks(range(len(states)), states)
+    plt.title('Transition Matrix Heatmap', fontsize=14)
+    plt.tight_layout()
+    plt.grid(False)
+    if output_path:
+        plt.savefig(output_path)
+        plt.close()
+    else:
+        plt.show()
 
 def categorize_url(url):
     """Categorize URL into states"""
@@ -224,22 +262,75 @@ def categorize_url(url):
     
     return 'other'
 
-if __name__ == "__main__":
+def format_matrix(matrix, states, output_format):
+    """Render the transition matrix as json or csv text"""
+    if output_format == 'json':
+        return json.dumps({'states': states, 'transition_matrix': matrix.tolist()}, indent=2)
+    lines = ['from_state,' + ','.join(states)]
+    for i, from_state in enumerate(states):
+        lines.append(from_state + ',' + ','.join(f"{p:.6f}" for p in matrix[i]))
+    return '\n'.join(lines)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Derive a UserAgent transition matrix from request logs"
+    )
+    parser.add_argument('inputs', nargs='+', help="CSV log file(s) to analyze")
+    parser.add_argument('--session-gap', type=float, default=30,
+                        help="Minutes of inactivity that start a new session (default: 30)")
+    parser.add_argument('--format', choices=['text', 'json', 'csv'], default='text',
+                        help="Output format for the transition matrix (default: text)")
+    parser.add_argument('-o', '--output',
+                        help="Write the json/csv matrix to this file instead of stdout")
+    heatmap = parser.add_mutually_exclusive_group()
+    heatmap.add_argument('--heatmap', metavar='PATH',
+                         help="Save a heatmap image to PATH (headless)")
+    heatmap.add_argument('--show', action='store_true',
+                         help="Open the heatmap in an interactive window")
+    parser.add_argument('--stats', action='store_true',
+                        help="Print stationary distribution, hitting times and diagnostics")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.output and args.format == 'text':
+        parser.error("--output requires --format json or csv")
     try:
-        file_path = '../pathTo.csv'  # file path
-        matrix, states, transitions = analyze_logical_transitions(file_path)
-       # validate_matrix(matrix, states)
+        matrix, states, transitions = analyze_logical_transitions(
+            args.inputs, args.session_gap, verbose=args.format == 'text'
+        )
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.format != 'text':
+        rendered = format_matrix(matrix, states, args.format)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(rendered + '\n')
+        else:
+            print(rendered)
+    else:
         print("\nAnalysis complete - Transition matrix reflects logical application flow.")
-        plt.figure(figsize=(10, 8))
-        plt.imshow(matrix, cmap='YlGnBu', interpolation='nearest')
-        plt.gca().set_facecolor('white')   # axes background
-        plt.gcf().set_facecolor('white')   # figure background
-        plt.colorbar()
-        plt.xticks(range(len(states)), states, rotation=45, ha='right')
-        plt.yticks(range(len(states)), states)
-        plt.title('Transition Matrix Heatmap', fontsize=14)
-        plt.tight_layout()
-        plt.grid(False)
-        plt.show()
-    except Exception as e:
-        print(f"Error: {e}")
+
+    if args.stats:
+        try:
+            from libexec.userAgent.transition_analysis import analyze_transition_matrix, print_analysis
+        except ImportError:
+            # Running as a standalone script from the repository
+            from transition_analysis import analyze_transition_matrix, print_analysis
+        analysis = analyze_transition_matrix(matrix, states)
+        # Keep stdout parseable when the matrix itself is printed there
+        if args.format != 'text' and not args.output:
+            with contextlib.redirect_stdout(sys.stderr):
+                print_analysis(analysis)
+        else:
+            print_analysis(analysis)
+
+    if args.heatmap or args.show:
+        plot_heatmap(matrix, states, args.heatmap)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())